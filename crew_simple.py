@@ -4,69 +4,183 @@ from tools.yf_tech_analysis import YFinanceTechnicalAnalysisTool
 from tools.yf_fundamental_analysis import YFinanceFundamentalAnalysisTool
 from tools.sentiment_analysis import RedditSentimentAnalysisTool
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pydantic import BaseModel, Field
+import asyncio
+import orjson
 import os
+import threading
 
 load_dotenv()
 api_key = os.getenv("GOOGLE_API_KEY")
 
-def run_analysis(stock_symbol):
+# Fold the research, technical and fundamental phases into one LLM call (2 calls instead of 4).
+# Useful when API quota rather than latency is the bottleneck.
+batch_phases = os.getenv("BATCH_LLM_PHASES", "false").lower() == "true"
+
+# Reddit sentiment is optional: the report goes ahead without it after this many seconds.
+# It runs on its own executor because asyncio.run() waits for the default executor's threads
+# on exit, which would let a hung Reddit request stall the pipeline anyway.
+sentiment_timeout = float(os.getenv("SENTIMENT_TIMEOUT", "8"))
+_sentiment_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="reddit-sentiment")
+
+class PhaseSummaries(BaseModel):
+    """Structured output of the batched research/technical/fundamental call"""
+    research: str = Field(description="Summary of recent news, analyst ratings, and market sentiment")
+    technical: str = Field(description="Technical analysis summary with buy/sell/hold recommendation")
+    fundamental: str = Field(description="Fundamental analysis summary with valuation assessment")
+
+@lru_cache(maxsize=1)
+def get_llm():
+    """Create the Google Gemini chat model once; the instance is shared and never mutated"""
+    return ChatGoogleGenerativeAI(model="gemini-flash-latest", google_api_key=api_key, temperature=0.7)
+
+def run_analysis(stock_symbol, llm=None, history=None, period="1y", batched=None):
     """Run financial analysis using Google Gemini"""
+    return {
+        'report': ''.join(stream_analysis(stock_symbol, llm, history, period, batched))
+    }
+
+def stream_analysis(stock_symbol, llm=None, history=None, period="1y", batched=None):
+    """Run financial analysis, yielding the final report in chunks as Gemini generates it"""
+    llm = llm or get_llm()
+    batched = batch_phases if batched is None else batched
+    final_prompt = asyncio.run(_build_final_prompt(stock_symbol, llm, history, period, batched))
     
-    llm = ChatGoogleGenerativeAI(model="gemini-flash-latest", google_api_key=api_key, temperature=0.7)
+    # Final Report
+    print("\n=== Generating Final Report ===")
+    for chunk in llm.stream(final_prompt):
+        yield chunk.text
+
+def _to_json(data):
+    """Serialize tool output compactly for prompts (NumPy values included, NaN becomes null)"""
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY, default=str).decode()
+
+_reddit_tool = None
+_reddit_tool_error = None
+_reddit_tool_lock = threading.Lock()
+
+def _get_reddit_tool():
+    """Create the Reddit sentiment tool once; a failed construction is remembered, not retried"""
+    global _reddit_tool, _reddit_tool_error
+    with _reddit_tool_lock:
+        if _reddit_tool is None and _reddit_tool_error is None:
+            try:
+                # Loads the sentiment model and the Reddit client (fails without the REDDIT_* settings)
+                _reddit_tool = RedditSentimentAnalysisTool()
+            except Exception as e:
+                _reddit_tool_error = e
+        if _reddit_tool_error is not None:
+            raise RuntimeError("Reddit sentiment tool unavailable") from _reddit_tool_error
+        return _reddit_tool
+
+def _reddit_sentiment(stock_symbol):
+    return _get_reddit_tool()._run(stock_symbol)
+
+# Build the tool in the background at import so the first analysis does not spend its budget on it
+_sentiment_executor.submit(_get_reddit_tool)
+
+async def _fetch_sentiment(stock_symbol):
+    """Fetch Reddit sentiment, degrading to a placeholder if it fails or exceeds the timeout"""
+    loop = asyncio.get_running_loop()
+    try:
+        # Tool lookup and request are timed together: calls abandoned by wait_for keep their worker
+        # busy, so a later call may queue for a free one, but never for longer than the timeout
+        sentiment_data = await asyncio.wait_for(
+            loop.run_in_executor(_sentiment_executor, _reddit_sentiment, stock_symbol),
+            timeout=sentiment_timeout,
+        )
+        return f"Reddit Sentiment: {_to_json(sentiment_data)}"
+    except Exception:
+        return "Reddit sentiment data unavailable"
+
+def _research_prompt(stock_symbol):
+    return f"""Conduct research on {stock_symbol}. Search for recent news, analyst ratings, and market sentiment.
+    Provide a comprehensive summary of your findings."""
+
+def _tech_prompt(stock_symbol, tech_data):
+    return f"""Based on this technical data for {stock_symbol}:
+    {_to_json(tech_data)}
+    
+    Provide a technical analysis summary with buy/sell/hold recommendation."""
+
+def _fundamental_prompt(stock_symbol, fundamental_data):
+    return f"""Based on this fundamental data for {stock_symbol}:
+    {_to_json(fundamental_data)}
+    
+    Provide a fundamental analysis summary with valuation assessment."""
+
+async def _analyze_when_ready(llm, stock_symbol, data_task, build_prompt):
+    """Start an LLM phase as soon as the tool data it depends on has been fetched"""
+    data = await data_task
+    result = await llm.ainvoke(build_prompt(stock_symbol, data))
+    return result.text
+
+async def _summarize_parallel(llm, stock_symbol, tech_data_task, fundamental_data_task):
+    """Run the three analysis phases as concurrent LLM calls (latency-bound deployments)"""
+    research_result, tech_summary, fundamental_summary = await asyncio.gather(
+        llm.ainvoke(_research_prompt(stock_symbol)),
+        _analyze_when_ready(llm, stock_symbol, tech_data_task, _tech_prompt),
+        _analyze_when_ready(llm, stock_symbol, fundamental_data_task, _fundamental_prompt),
+    )
+    return research_result.text, tech_summary, fundamental_summary
+
+async def _summarize_batched(llm, stock_symbol, tech_data_task, fundamental_data_task):
+    """Answer the three analysis prompts with a single structured LLM call (quota-bound deployments)"""
+    tech_data, fundamental_data = await asyncio.gather(tech_data_task, fundamental_data_task)
+    batched_prompt = f"""Complete the following three independent analyses of {stock_symbol} and return each one in its own field.
+
+research:
+{_research_prompt(stock_symbol)}
+
+technical:
+{_tech_prompt(stock_symbol, tech_data)}
+
+fundamental:
+{_fundamental_prompt(stock_symbol, fundamental_data)}"""
+    summaries = await llm.with_structured_output(PhaseSummaries).ainvoke(batched_prompt)
+    return summaries.research, summaries.technical, summaries.fundamental
+
+async def _build_final_prompt(stock_symbol, llm, history, period, batched):
+    """Run the data fetches and analysis phases as a dependency graph and build the final report prompt"""
     
     # Initialize tools
     search_tool = SearchInternetTool()
     news_tool = SearchNewsTool()
     yf_tech_tool = YFinanceTechnicalAnalysisTool()
     yf_fundamental_tool = YFinanceFundamentalAnalysisTool()
-    reddit_tool = RedditSentimentAnalysisTool()
     
     print(f"Running analysis for stock: {stock_symbol}")
     
-    # Research Analysis
-    print("\n=== Research Phase ===")
-    research_prompt = f"""Conduct research on {stock_symbol}. Search for recent news, analyst ratings, and market sentiment.
-    Provide a comprehensive summary of your findings."""
-    research_result = llm.invoke(research_prompt)
-    
-    # Technical Analysis
-    print("\n=== Technical Analysis Phase ===")
-    tech_data = yf_tech_tool._run(stock_symbol)
-    tech_prompt = f"""Based on this technical data for {stock_symbol}:
-    {tech_data}
-    
-    Provide a technical analysis summary with buy/sell/hold recommendation."""
-    tech_result = llm.invoke(tech_prompt)
-    
-    # Fundamental Analysis
-    print("\n=== Fundamental Analysis Phase ===")
-    fundamental_data = yf_fundamental_tool._run(stock_symbol)
-    fundamental_prompt = f"""Based on this fundamental data for {stock_symbol}:
-    {fundamental_data}
-    
-    Provide a fundamental analysis summary with valuation assessment."""
-    fundamental_result = llm.invoke(fundamental_prompt)
+    # Start every data fetch at once (the tools are blocking, so they run in worker threads).
+    # Research needs no data, and each other LLM phase starts as soon as its own data arrives,
+    # so Yahoo, Reddit and Gemini latencies all overlap.
+    print("\n=== Data Collection and Analysis Phases ===")
+    tech_data_task = asyncio.create_task(asyncio.to_thread(yf_tech_tool._run, stock_symbol, period, history))
+    fundamental_data_task = asyncio.create_task(asyncio.to_thread(yf_fundamental_tool._run, stock_symbol))
+    sentiment_task = asyncio.create_task(_fetch_sentiment(stock_symbol))
     
-    # Sentiment Analysis
-    print("\n=== Sentiment Analysis Phase ===")
-    try:
-        sentiment_data = reddit_tool._run(stock_symbol)
-        sentiment_summary = f"Reddit Sentiment: {sentiment_data}"
-    except:
-        sentiment_summary = "Reddit sentiment data unavailable"
+    if batched:
+        research_summary, tech_summary, fundamental_summary = await _summarize_batched(
+            llm, stock_symbol, tech_data_task, fundamental_data_task
+        )
+    else:
+        research_summary, tech_summary, fundamental_summary = await _summarize_parallel(
+            llm, stock_symbol, tech_data_task, fundamental_data_task
+        )
+    sentiment_summary = await sentiment_task
     
-    # Final Report
-    print("\n=== Generating Final Report ===")
-    final_prompt = f"""Create a comprehensive investment report for {stock_symbol}.
+    return f"""Create a comprehensive investment report for {stock_symbol}.
 
 Research Findings:
-{research_result.content}
+{research_summary}
 
 Technical Analysis:
-{tech_result.content}
+{tech_summary}
 
 Fundamental Analysis:
-{fundamental_result.content}
+{fundamental_summary}
 
 Sentiment Analysis:
 {sentiment_summary}
@@ -78,12 +192,6 @@ Provide a final investment recommendation with:
 4. Price Target (12-month)
 5. Key Risks
 """
-    
-    final_report = llm.invoke(final_prompt)
-    
-    return {
-        'report': final_report.content
-    }
 
 if __name__ == "__main__":
     result = run_analysis('AAPL')
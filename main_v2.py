@@ -1,9 +1,14 @@
 import streamlit as st
-import yfinance as yf
+import numpy as np
+import pandas as pd
 import plotly.graph_objs as go
 from plotly.subplots import make_subplots
-from crew_simple import run_analysis
+from crew_simple import get_llm, stream_analysis
+from tools._yf_history import HISTORY_TTL, download_history
+from datetime import datetime, timezone
 import json
+import re
+import time
 
 # Page Configuration
 st.set_page_config(
@@ -14,158 +19,162 @@ st.set_page_config(
 )
 
 # Custom CSS for Modern Styling
+_CSS = """
+    /* Main Background */
+    .stApp {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    }
+
+    /* Sidebar Styling */
+    [data-testid="stSidebar"] {
+        background: linear-gradient(180deg, #1e3c72 0%, #2a5298 100%);
+    }
+
+    [data-testid="stSidebar"] .stMarkdown {
+        color: white;
+    }
+
+    /* Header Styling */
+    .main-header {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 2rem;
+        border-radius: 15px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+    }
+
+    .main-title {
+        font-size: 3rem;
+        font-weight: 800;
+        color: #F5F5DC;
+        margin: 0;
+        text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.2);
+    }
+
+    .main-subtitle {
+        font-size: 1.2rem;
+        color: #f0f0f0;
+        margin-top: 0.5rem;
+    }
+
+    /* Card Styling */
+    .info-card {
+        background: rgba(255, 255, 255, 0.95);
+        border-radius: 15px;
+        padding: 2rem;
+        margin: 1rem 0;
+        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+        backdrop-filter: blur(10px);
+        border: 1px solid rgba(255, 255, 255, 0.2);
+    }
+
+    .analysis-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        border-radius: 15px;
+        padding: 2rem;
+        margin: 1rem 0;
+        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.2);
+        color: white;
+    }
+
+    .report-card {
+        background: white;
+        border-radius: 15px;
+        padding: 2rem;
+        margin: 1rem 0;
+        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+        border-left: 5px solid #667eea;
+    }
+
+    /* Button Styling */
+    .stButton>button {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        border: none;
+        border-radius: 10px;
+        padding: 0.75rem 2rem;
+        font-size: 1.1rem;
+        font-weight: 600;
+        transition: all 0.3s ease;
+        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
+    }
+
+    .stButton>button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 6px 20px rgba(102, 126, 234, 0.6);
+    }
+
+    /* Input Styling */
+    .stTextInput>div>div>input {
+        border-radius: 10px;
+        border: 2px solid #667eea;
+        padding: 0.75rem;
+    }
+
+    .stSelectbox>div>div>select {
+        border-radius: 10px;
+        border: 2px solid #667eea;
+    }
+
+    /* Metric Cards */
+    .metric-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        border-radius: 15px;
+        padding: 1.5rem;
+        text-align: center;
+        color: white;
+        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
+    }
+
+    .metric-value {
+        font-size: 2.5rem;
+        font-weight: 700;
+        margin: 0.5rem 0;
+    }
+
+    .metric-label {
+        font-size: 1rem;
+        opacity: 0.9;
+    }
+
+    /* Success/Error Messages */
+    .stSuccess {
+        background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
+        color: white;
+        border-radius: 10px;
+        padding: 1rem;
+    }
+
+    .stError {
+        background: linear-gradient(135deg, #eb3349 0%, #f45c43 100%);
+        color: white;
+        border-radius: 10px;
+        padding: 1rem;
+    }
+
+    /* Spinner */
+    .stSpinner > div {
+        border-top-color: #667eea !important;
+    }
+
+    /* Section Headers */
+    .section-header {
+        font-size: 2rem;
+        font-weight: 700;
+        color: white;
+        margin: 2rem 0 1rem 0;
+        padding-bottom: 0.5rem;
+        border-bottom: 3px solid white;
+    }
+"""
+
+# Streamlit drops any element that is not re-emitted on a rerun, so the style block
+# is still sent every time; comments and whitespace are stripped once here to keep it small.
+_CSS_HTML = "<style>" + re.sub(r"\s+", " ", re.sub(r"/\*.*?\*/", "", _CSS, flags=re.S)).strip() + "</style>"
+
 def add_custom_css():
-    st.markdown("""
-        <style>
-            /* Main Background */
-            .stApp {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            }
-            
-            /* Sidebar Styling */
-            [data-testid="stSidebar"] {
-                background: linear-gradient(180deg, #1e3c72 0%, #2a5298 100%);
-            }
-            
-            [data-testid="stSidebar"] .stMarkdown {
-                color: white;
-            }
-            
-            /* Header Styling */
-            .main-header {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                padding: 2rem;
-                border-radius: 15px;
-                text-align: center;
-                margin-bottom: 2rem;
-                box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-            }
-            
-            .main-title {
-                font-size: 3rem;
-                font-weight: 800;
-                color: #F5F5DC;
-                margin: 0;
-                text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.2);
-            }
-            
-            .main-subtitle {
-                font-size: 1.2rem;
-                color: #f0f0f0;
-                margin-top: 0.5rem;
-            }
-            
-            /* Card Styling */
-            .info-card {
-                background: rgba(255, 255, 255, 0.95);
-                border-radius: 15px;
-                padding: 2rem;
-                margin: 1rem 0;
-                box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-                backdrop-filter: blur(10px);
-                border: 1px solid rgba(255, 255, 255, 0.2);
-            }
-            
-            .analysis-card {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                border-radius: 15px;
-                padding: 2rem;
-                margin: 1rem 0;
-                box-shadow: 0 8px 32px rgba(0, 0, 0, 0.2);
-                color: white;
-            }
-            
-            .report-card {
-                background: white;
-                border-radius: 15px;
-                padding: 2rem;
-                margin: 1rem 0;
-                box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-                border-left: 5px solid #667eea;
-            }
-            
-            /* Button Styling */
-            .stButton>button {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                border: none;
-                border-radius: 10px;
-                padding: 0.75rem 2rem;
-                font-size: 1.1rem;
-                font-weight: 600;
-                transition: all 0.3s ease;
-                box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-            }
-            
-            .stButton>button:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 6px 20px rgba(102, 126, 234, 0.6);
-            }
-            
-            /* Input Styling */
-            .stTextInput>div>div>input {
-                border-radius: 10px;
-                border: 2px solid #667eea;
-                padding: 0.75rem;
-            }
-            
-            .stSelectbox>div>div>select {
-                border-radius: 10px;
-                border: 2px solid #667eea;
-            }
-            
-            /* Metric Cards */
-            .metric-card {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                border-radius: 15px;
-                padding: 1.5rem;
-                text-align: center;
-                color: white;
-                box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
-            }
-            
-            .metric-value {
-                font-size: 2.5rem;
-                font-weight: 700;
-                margin: 0.5rem 0;
-            }
-            
-            .metric-label {
-                font-size: 1rem;
-                opacity: 0.9;
-            }
-            
-            /* Success/Error Messages */
-            .stSuccess {
-                background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-                color: white;
-                border-radius: 10px;
-                padding: 1rem;
-            }
-            
-            .stError {
-                background: linear-gradient(135deg, #eb3349 0%, #f45c43 100%);
-                color: white;
-                border-radius: 10px;
-                padding: 1rem;
-            }
-            
-            /* Spinner */
-            .stSpinner > div {
-                border-top-color: #667eea !important;
-            }
-            
-            /* Section Headers */
-            .section-header {
-                font-size: 2rem;
-                font-weight: 700;
-                color: white;
-                margin: 2rem 0 1rem 0;
-                padding-bottom: 0.5rem;
-                border-bottom: 3px solid white;
-            }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_CSS_HTML, unsafe_allow_html=True)
 # Main Function
 def main():
     add_custom_css()
@@ -221,14 +230,15 @@ def stock_analysis_section():
         default=['Volume']
     )
     
+    force_refresh = st.sidebar.checkbox("🔄 Force refresh", value=False, help="Ignore today's cached AI analysis and run it again")
     analyze_button = st.sidebar.button("🚀 Analyze Stock", use_container_width=True)
     
     if analyze_button:
         # Fetch stock data
         with st.spinner(f"🔍 Fetching data for {stock_symbol}..."):
-            stock_data = yf.Ticker(stock_symbol).history(period=time_period, interval="1d")
+            stock_data = get_stock_data(stock_symbol, time_period)
         
-        if not stock_data.empty:
+        if stock_data is not None and not stock_data.empty:
             # Display stock metrics
             col1, col2, col3, col4 = st.columns(4)
             
@@ -269,10 +279,13 @@ def stock_analysis_section():
                 """, unsafe_allow_html=True)
             
             # Chart
-            st.plotly_chart(plot_stock_chart(stock_data, indicators), use_container_width=True)
+            st.plotly_chart(
+                cached_stock_chart(stock_symbol, stock_data, tuple(indicators)),
+                use_container_width=True
+            )
             
             # AI Analysis
-            analysis = perform_crew_analysis(stock_symbol)
+            analysis = perform_crew_analysis(stock_symbol, time_period, stock_data, force_refresh)
             
             if analysis:
                 st.markdown("""
@@ -284,14 +297,33 @@ def stock_analysis_section():
         else:
             st.error("❌ Unable to fetch stock data. Please check the symbol and try again.")
         
-# Fetch Stock Data
+# Fetch Stock Data (shared by the metrics, the chart and the technical analysis)
 def get_stock_data(stock_symbol, period='1y'):
+    stock_cache = st.session_state.setdefault('stock_data', {})
+    cached = stock_cache.get((stock_symbol, period))
+    if cached is not None and time.time() - cached[0] < HISTORY_TTL:
+        return cached[1]
+
     try:
-        return yf.download(stock_symbol, period=period)
+        history = download_history([stock_symbol], period).get(stock_symbol)
     except Exception as e:
         st.error(f"Error fetching stock data: {e}")
         return None
 
+    # yfinance reports failures as an empty frame, so only keep real data
+    if history is not None and not history.empty:
+        stock_cache[(stock_symbol, period)] = (time.time(), history)
+    return history
+
+# Cheap cache key for price history: date range, row count and latest close
+def stock_data_fingerprint(stock_data):
+    return stock_data.index[0], stock_data.index[-1], len(stock_data), stock_data['Close'].iloc[-1]
+
+# Cached Stock Chart (skips figure construction on reruns with the same inputs)
+@st.cache_data(ttl=HISTORY_TTL, show_spinner=False, hash_funcs={pd.DataFrame: stock_data_fingerprint})
+def cached_stock_chart(stock_symbol, stock_data, indicators):
+    return plot_stock_chart(stock_data, indicators)
+
 # Plot Stock Chart
 def plot_stock_chart(stock_data, indicators):
     if stock_data.empty or stock_data.isnull().any().any():
@@ -321,8 +353,9 @@ def plot_stock_chart(stock_data, indicators):
 
     # Volume chart
     if 'Volume' in indicators:
-        colors = ['#11998e' if stock_data['Close'].iloc[i] >= stock_data['Open'].iloc[i] 
-                  else '#eb3349' for i in range(len(stock_data))]
+        close_arr = stock_data['Close'].to_numpy()
+        open_arr = stock_data['Open'].to_numpy()
+        colors = np.where(close_arr >= open_arr, '#11998e', '#eb3349')
         fig.add_trace(
             go.Bar(
                 x=stock_data.index,
@@ -364,12 +397,56 @@ def plot_stock_chart(stock_data, indicators):
     return fig
 
 
-def perform_crew_analysis(stock_symbol):
+# One LLM client for the whole process, reused by every session and rerun
+@st.cache_resource
+def get_llm_client():
+    return get_llm()
+
+
+# Finished reports shared across sessions, keyed by (symbol, period, UTC date), so repeated
+# analyses within the hour skip the LLM calls
+ANALYSIS_TTL = 3600
+
+@st.cache_resource
+def report_cache():
+    return {}
+
+
+def perform_crew_analysis(stock_symbol, time_period, stock_data, force_refresh=False):
+    reports = report_cache()
+    key = (stock_symbol, time_period, datetime.now(timezone.utc).date().isoformat())
+    if force_refresh:
+        reports.pop(key, None)
+
+    cached = reports.get(key)
+    if cached is not None and time.time() - cached[0] < ANALYSIS_TTL:
+        analysis_result = cached[1]
+        st.write(analysis_result['report'])
+    else:
+        analysis_result = stream_crew_analysis(stock_symbol, time_period, stock_data)
+        if analysis_result is None:
+            return None
+
+        # Drop expired reports (e.g. from previous days) before storing the new one
+        now = time.time()
+        for expired in [k for k, (created, _) in list(reports.items()) if now - created >= ANALYSIS_TTL]:
+            reports.pop(expired, None)
+        reports[key] = (now, analysis_result)
+
+    st.session_state.setdefault('last_report', {})[stock_symbol] = analysis_result
+    return analysis_result
+
+
+def stream_crew_analysis(stock_symbol, time_period, stock_data):
     with st.spinner("🤖 AI Agents analyzing... This may take a moment..."):
         try:
-            analysis_result = run_analysis(stock_symbol)
-            st.write(analysis_result['report'])
-            return analysis_result
+            placeholder = st.empty()
+            report = ""
+            chunks = stream_analysis(stock_symbol, llm=get_llm_client(), history=stock_data, period=time_period)
+            for chunk in chunks:
+                report += chunk
+                placeholder.markdown(report)
+            return {'report': report}
 
         except Exception as e:
             st.error(f"⚠️ Analysis failed: {str(e)}")
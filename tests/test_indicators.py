@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.signal import find_peaks
+
+from tools._indicators import compute_latest, local_maxima
+
+
+def _random_prices(n, seed):
+    """Random-walk OHLC prices; continuous values, so no two samples are exactly tied."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.uniform(0, 2, n)
+    low = close - rng.uniform(0, 2, n)
+    return close, high, low
+
+
+def _reference_latest(close, high, low):
+    """The same indicators computed with pandas, following the `ta` package's definitions."""
+    close_s, high_s, low_s = pd.Series(close), pd.Series(high), pd.Series(low)
+
+    change = close_s.diff().fillna(0.0)
+    avg_gain = change.clip(lower=0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    avg_loss = (-change).clip(lower=0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+
+    macd = (
+        close_s.ewm(span=12, adjust=False).mean() - close_s.ewm(span=26, adjust=False).mean()
+    ).iloc[25:]
+    macd_signal = macd.ewm(span=9, min_periods=9, adjust=False).mean()
+
+    prev_close = close_s.shift(1)
+    true_range = pd.concat(
+        [high_s - low_s, (high_s - prev_close).abs(), (low_s - prev_close).abs()], axis=1
+    ).max(axis=1)
+    atr_seed = pd.Series([true_range.iloc[:14].mean()])
+    atr = pd.concat([atr_seed, true_range.iloc[14:]]).ewm(alpha=1 / 14, adjust=False).mean()
+
+    return (
+        rsi.iloc[-1],
+        macd.iloc[-1] if len(macd) else np.nan,
+        macd_signal.iloc[-1] if len(macd) else np.nan,
+        (macd - macd_signal).iloc[-1] if len(macd) else np.nan,
+        atr.iloc[-1] if len(close) >= 14 else np.nan,
+    )
+
+
+@pytest.mark.parametrize("n", [10, 14, 30, 34, 252, 1000])
+def test_compute_latest_matches_pandas(n):
+    close, high, low = _random_prices(n, seed=n)
+    expected = _reference_latest(close, high, low)
+    np.testing.assert_allclose(compute_latest(close, high, low), expected, rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("distance", [1, 5, 20])
+def test_local_maxima_matches_find_peaks(seed, distance):
+    close, _, _ = _random_prices(500, seed)
+    for series in (close, -close):
+        expected = find_peaks(series, distance=distance)[0]
+        np.testing.assert_array_equal(local_maxima(series, distance), expected)
+
+
+def test_local_maxima_flat_peak_reports_middle_sample():
+    x = np.array([0.0, 1.0, 3.0, 3.0, 3.0, 1.0, 0.0])
+    np.testing.assert_array_equal(local_maxima(x, 1), [3])
@@ -0,0 +1,97 @@
+import asyncio
+import importlib
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+TIMEOUT = 0.3
+
+# Modules imported by crew_simple that reach external services; replaced by stubs so the
+# sentiment pipeline can be exercised offline
+STUBBED_MODULES = {
+    "langchain_google_genai": ["ChatGoogleGenerativeAI"],
+    "dotenv": ["load_dotenv"],
+    "tools.search_tool": ["SearchInternetTool", "SearchNewsTool"],
+    "tools.yf_tech_analysis": ["YFinanceTechnicalAnalysisTool"],
+    "tools.yf_fundamental_analysis": ["YFinanceFundamentalAnalysisTool"],
+}
+
+
+class _SlowRedditTool:
+    """Stands in for RedditSentimentAnalysisTool; `_run` blocks until the test releases it."""
+
+    constructed = 0
+    release = threading.Event()
+
+    def __init__(self):
+        type(self).constructed += 1
+
+    def _run(self, stock_symbol):
+        self.release.wait()
+        return {"stock_symbol": stock_symbol}
+
+
+class _BrokenRedditTool:
+    """Fails like RedditSentimentAnalysisTool does when the REDDIT_* settings are missing."""
+
+    constructed = 0
+
+    def __init__(self):
+        type(self).constructed += 1
+        raise ValueError("Required configuration setting 'client_id' missing")
+
+
+def _import_crew_simple(monkeypatch, tool_class):
+    for name, attributes in STUBBED_MODULES.items():
+        stub = types.ModuleType(name)
+        for attribute in attributes:
+            setattr(stub, attribute, lambda *args, **kwargs: None)
+        monkeypatch.setitem(sys.modules, name, stub)
+    sentiment_stub = types.ModuleType("tools.sentiment_analysis")
+    sentiment_stub.RedditSentimentAnalysisTool = tool_class
+    monkeypatch.setitem(sys.modules, "tools.sentiment_analysis", sentiment_stub)
+    monkeypatch.delitem(sys.modules, "crew_simple", raising=False)
+
+    crew_simple = importlib.import_module("crew_simple")
+    monkeypatch.setattr(crew_simple, "sentiment_timeout", TIMEOUT)
+    return crew_simple
+
+
+@pytest.fixture
+def slow_tool():
+    _SlowRedditTool.constructed = 0
+    _SlowRedditTool.release.clear()
+    yield _SlowRedditTool
+    # Let the abandoned worker threads finish so the interpreter can exit
+    _SlowRedditTool.release.set()
+
+
+def test_sentiment_timeout_holds_when_executor_is_saturated(monkeypatch, slow_tool):
+    crew_simple = _import_crew_simple(monkeypatch, slow_tool)
+    workers = crew_simple._sentiment_executor._max_workers
+
+    async def fetch_all(count):
+        # The outer guard turns a regression into a failure instead of a hung test
+        calls = asyncio.gather(*(crew_simple._fetch_sentiment("AAPL") for _ in range(count)))
+        return await asyncio.wait_for(calls, timeout=5)
+
+    # Occupy every worker with a hung Reddit request
+    assert asyncio.run(fetch_all(workers)) == ["Reddit sentiment data unavailable"] * workers
+
+    # The next call has no free worker, but must still give up after the timeout
+    start = time.perf_counter()
+    assert asyncio.run(fetch_all(1)) == ["Reddit sentiment data unavailable"]
+    assert time.perf_counter() - start < TIMEOUT + 0.5
+    assert slow_tool.constructed == 1
+
+
+def test_failed_tool_construction_is_not_retried(monkeypatch):
+    _BrokenRedditTool.constructed = 0
+    crew_simple = _import_crew_simple(monkeypatch, _BrokenRedditTool)
+
+    for _ in range(3):
+        assert asyncio.run(crew_simple._fetch_sentiment("AAPL")) == "Reddit sentiment data unavailable"
+    assert _BrokenRedditTool.constructed == 1
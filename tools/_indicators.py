@@ -0,0 +1,148 @@
+import numpy as np
+
+# Numba is optional: without it the kernels below run as plain Python loops,
+# which is slower but still fine for a few years of daily prices.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def compute_latest(close, high, low):
+    """
+    Compute the latest RSI(14), MACD(12, 26, 9) and ATR(14) values.
+
+    Only the final value of each indicator is kept, so no per-row arrays are allocated;
+    the recurrences are carried through a single pass. RSI and ATR use Wilder's smoothing
+    and MACD uses exponential moving averages, matching the `ta` package. A value is NaN
+    when there are not enough data points for it.
+
+    Args:
+        close (np.ndarray): The closing prices (float64).
+        high (np.ndarray): The daily highs (float64).
+        low (np.ndarray): The daily lows (float64).
+
+    Returns:
+        tuple: Scalars (rsi14, macd, macd_signal, macd_hist, atr14).
+    """
+    n = close.shape[0]
+
+    alpha_fast = 2.0 / (12 + 1)
+    alpha_slow = 2.0 / (26 + 1)
+    alpha_signal = 2.0 / (9 + 1)
+    alpha_wilder = 1.0 / 14
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    ema_fast = 0.0
+    ema_slow = 0.0
+    macd = np.nan
+    signal = np.nan
+    tr_sum = 0.0
+    atr = np.nan
+
+    for i in range(n):
+        price = close[i]
+
+        # RSI: Wilder-smoothed average gains and losses (the first change counts as zero)
+        if i >= 1:
+            change = price - close[i - 1]
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            avg_gain = alpha_wilder * gain + (1 - alpha_wilder) * avg_gain
+            avg_loss = alpha_wilder * loss + (1 - alpha_wilder) * avg_loss
+
+        # MACD: EMA recurrences seeded with the first close
+        if i == 0:
+            ema_fast = price
+            ema_slow = price
+        else:
+            ema_fast = alpha_fast * price + (1 - alpha_fast) * ema_fast
+            ema_slow = alpha_slow * price + (1 - alpha_slow) * ema_slow
+        if i >= 25:
+            macd = ema_fast - ema_slow
+            if i == 25:
+                signal = macd
+            else:
+                signal = alpha_signal * macd + (1 - alpha_signal) * signal
+
+        # ATR: true range averaged over the first window, then Wilder-smoothed
+        true_range = high[i] - low[i]
+        if i >= 1:
+            true_range = max(true_range, abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        if i < 14:
+            tr_sum += true_range
+            if i == 13:
+                atr = tr_sum / 14
+        else:
+            atr = (atr * 13 + true_range) / 14
+
+    rsi = np.nan
+    if n >= 14:
+        rsi = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    macd_signal = np.nan
+    macd_hist = np.nan
+    if n >= 34:
+        macd_signal = signal
+        macd_hist = macd - signal
+
+    return rsi, macd, macd_signal, macd_hist, atr
+
+
+@njit(cache=True)
+def local_maxima(x, distance):
+    """
+    Find local maxima that are at least `distance` samples apart.
+
+    Equivalent to `scipy.signal.find_peaks(x, distance=distance)[0]` (flat peaks report
+    their middle sample, and the highest peaks win when two are too close), without the
+    prominence/width bookkeeping SciPy sets up for features this project does not use.
+    Peaks of exactly equal height are resolved deterministically in favour of the later one.
+
+    Args:
+        x (np.ndarray): The series to search (float64).
+        distance (int): Minimum number of samples between neighbouring peaks.
+
+    Returns:
+        np.ndarray: Indices of the selected peaks, in ascending order.
+    """
+    n = x.shape[0]
+    candidates = np.empty(n // 2, dtype=np.int64)
+    count = 0
+
+    # Candidates: samples (or the middle of plateaus) higher than both neighbours
+    i = 1
+    while i < n - 1:
+        if x[i - 1] < x[i]:
+            i_ahead = i + 1
+            while i_ahead < n - 1 and x[i_ahead] == x[i]:
+                i_ahead += 1
+            if x[i_ahead] < x[i]:
+                candidates[count] = (i + i_ahead - 1) // 2
+                count += 1
+                i = i_ahead
+        i += 1
+    peaks = candidates[:count]
+
+    # Keep the highest peaks first, discarding lower ones closer than `distance`
+    keep = np.ones(count, dtype=np.bool_)
+    order = np.argsort(x[peaks], kind="mergesort")
+    for rank in range(count - 1, -1, -1):
+        j = order[rank]
+        if not keep[j]:
+            continue
+        k = j - 1
+        while k >= 0 and peaks[j] - peaks[k] < distance:
+            keep[k] = False
+            k -= 1
+        k = j + 1
+        while k < count and peaks[k] - peaks[j] < distance:
+            keep[k] = False
+            k += 1
+
+    return peaks[keep]
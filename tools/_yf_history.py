@@ -0,0 +1,74 @@
+import time
+from functools import lru_cache
+
+import pandas as pd
+import yfinance as yf
+
+# How long fetched price history is reused in-process (in seconds). yfinance manages
+# its own HTTP session (curl_cffi) and rejects caching sessions, so no session is passed.
+HISTORY_TTL = 3600
+
+
+class _EmptyHistory(Exception):
+    """Carries an empty (failed) fetch out of the memoized call; lru_cache does not keep raised results."""
+
+    def __init__(self, history):
+        super().__init__()
+        self.history = history
+
+
+@lru_cache(maxsize=128)
+def _fetch_history(ticker, period, ttl_bucket):
+    history = yf.Ticker(ticker).history(period=period)
+    if history.empty:
+        raise _EmptyHistory(history)
+    return history
+
+
+def fetch_history(ticker: str, period: str = "1y"):
+    """
+    Fetch daily price history, memoized in-process for up to HISTORY_TTL seconds.
+
+    Empty results (yfinance's way of reporting a failed fetch) are not memoized, so the
+    next call retries the download.
+
+    The returned DataFrame is shared between callers and must not be modified.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        period (str): The time period to fetch (e.g., "1y" for 1 year).
+
+    Returns:
+        pd.DataFrame: The OHLCV history.
+    """
+    try:
+        return _fetch_history(ticker, period, int(time.time() // HISTORY_TTL))
+    except _EmptyHistory as empty:
+        return empty.history
+
+
+def download_history(tickers, period: str = "1y"):
+    """
+    Download daily price history for several tickers with one batched yf.download call.
+
+    Args:
+        tickers (list): The stock ticker symbols.
+        period (str): The time period to fetch (e.g., "1y" for 1 year).
+
+    Returns:
+        dict: The OHLCV history DataFrame for each ticker that returned data.
+    """
+    tickers = list(tickers)
+    data = yf.download(
+        tickers,
+        period=period,
+        group_by='ticker',
+        auto_adjust=True,
+        threads=True,
+        progress=False,
+    )
+    if not isinstance(data.columns, pd.MultiIndex):
+        return {tickers[0]: data}
+
+    returned = set(data.columns.get_level_values(0))
+    return {ticker: data[ticker].dropna(how='all') for ticker in tickers if ticker in returned}